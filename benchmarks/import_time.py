@@ -0,0 +1,73 @@
+"""Measure the module-level import cost of each page with ``python -X importtime``.
+
+Streamlit itself is already loaded by the server before any page runs, so it is
+imported first and excluded from the totals. Only the imports a page executes
+at module level are counted; imports deferred into figure builders are not.
+
+    python benchmarks/import_time.py
+"""
+
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["data_story_website.py"] + sorted(
+    os.path.join("pages", name) for name in os.listdir(os.path.join(ROOT, "pages")) if name.endswith(".py")
+)
+
+
+def module_level_imports(path):
+    with open(os.path.join(ROOT, path)) as f:
+        tree = ast.parse(f.read())
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def parse_importtime(stderr):
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, package = line[len("import time:"):].split("|")
+        if not package.startswith("  "):
+            # Nested imports are indented; only top-level entries are summed
+            totals[package.strip()] = int(cumulative)
+    return totals
+
+
+def measure(path):
+    statements = [stmt for stmt in module_level_imports(path) if stmt != "import streamlit as st"]
+    code = "import streamlit\n" + "\n".join(statements)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Everything imported after streamlit is attributable to the page
+    totals = parse_importtime(result.stderr)
+    names = list(totals)
+    page_modules = names[names.index("streamlit") + 1:] if "streamlit" in totals else names
+    return {name: totals[name] for name in page_modules}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=5, help="number of heaviest modules to list per page")
+    args = parser.parse_args()
+
+    for path in PAGES:
+        modules = measure(path)
+        total_ms = sum(modules.values()) / 1000
+        print(f"{path}: {total_ms:.1f} ms")
+        for name, us in sorted(modules.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+            print(f"    {name:<30} {us / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
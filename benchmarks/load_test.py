@@ -0,0 +1,274 @@
+"""Load-test the story with concurrent headless sessions against a local server.
+
+Starts ``streamlit run data_story_website.py`` on localhost, then opens N
+websocket sessions that each walk through every page, speaking the same
+protobuf protocol as the browser. For each page run it records the time to the
+first rendered element and to script completion. For each Plotly figure it
+records when the chart's element arrived. The server process's CPU time and
+peak RSS are sampled from /proc (Linux only).
+
+"cached" runs leave Streamlit's caches warm between sessions. "uncached" runs
+send the same clear-cache request as the app menu before every page, which
+reproduces reading the archive on every rerun.
+
+Needs over_one_mil_chars.zip; generate one with benchmarks/synthetic_data.py --out over_one_mil_chars.zip.
+
+    python benchmarks/load_test.py --sessions 16 --rounds 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.httpclient import HTTPRequest
+from tornado.websocket import websocket_connect
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import shared  # noqa: E402
+
+# Element ids end with the user key; shared.render_figure keys charts "<fig_id>-<16 hex digest>"
+FIGURE_ID = re.compile(r"^\$\$ID-[0-9a-f]+-(.+)-[0-9a-f]{16}$")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def start_server(port):
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", "data_story_website.py",
+            "--server.headless", "true",
+            "--server.address", "127.0.0.1",
+            "--server.port", str(port),
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"streamlit did not become healthy on port {port}")
+
+
+class ProcessSampler(threading.Thread):
+    def __init__(self, pid, interval=0.1):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss = 0
+        self._done = threading.Event()
+
+    def cpu_seconds(self):
+        with open(f"/proc/{self.pid}/stat") as f:
+            # utime and stime follow the parenthesised command name
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+    def rss_bytes(self):
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    def run(self):
+        while not self._done.is_set():
+            self.peak_rss = max(self.peak_rss, self.rss_bytes())
+            self._done.wait(self.interval)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def _send(ws, **fields):
+    msg = BackMsg()
+    if "clear_cache" in fields:
+        msg.clear_cache = True
+    else:
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = fields["page_script_hash"]
+    return ws.write_message(msg.SerializeToString(), binary=True)
+
+
+async def _run_page(ws, page_hash, figure_paths):
+    await _send(ws, page_script_hash=page_hash)
+    start = time.perf_counter()
+    result = {"first_element_s": None, "figures": {}, "errors": 0, "pages": None}
+
+    while True:
+        raw = await ws.read_message()
+        if raw is None:
+            raise ConnectionError("server closed the session")
+        msg = ForwardMsg()
+        msg.ParseFromString(raw)
+        kind = msg.WhichOneof("type")
+        elapsed = time.perf_counter() - start
+
+        if kind == "new_session" and result["pages"] is None:
+            result["pages"] = {page.page_script_hash: page.page_name for page in msg.new_session.app_pages}
+        elif kind in ("delta", "ref_hash"):
+            if result["first_element_s"] is None:
+                result["first_element_s"] = elapsed
+
+            # Cached messages arrive as ref_hash, so figures are also matched by their delta path
+            path = (page_hash, tuple(msg.metadata.delta_path))
+            if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                if element.WhichOneof("type") == "plotly_chart":
+                    match = FIGURE_ID.match(element.plotly_chart.id)
+                    if match:
+                        figure_paths[path] = match.group(1)
+                elif element.WhichOneof("type") == "exception":
+                    result["errors"] += 1
+            if path in figure_paths:
+                result["figures"][figure_paths[path]] = elapsed
+        elif kind == "script_finished":
+            result["render_s"] = elapsed
+            return result
+
+
+async def run_session(port, pages, rounds, clear_cache):
+    request = HTTPRequest(f"ws://127.0.0.1:{port}/_stcore/stream", headers={"Sec-WebSocket-Protocol": "streamlit"})
+    ws = await websocket_connect(request, max_message_size=256 * 1024 * 1024)
+    figure_paths = {}
+    runs = []
+    try:
+        for _ in range(rounds):
+            for page_hash, page_name in pages.items():
+                if clear_cache:
+                    await _send(ws, clear_cache=True)
+                result = await _run_page(ws, page_hash, figure_paths)
+                result["page"] = page_name
+                del result["pages"]
+                runs.append(result)
+    finally:
+        ws.close()
+    return runs
+
+
+async def discover_pages(port):
+    request = HTTPRequest(f"ws://127.0.0.1:{port}/_stcore/stream", headers={"Sec-WebSocket-Protocol": "streamlit"})
+    ws = await websocket_connect(request)
+    try:
+        result = await _run_page(ws, "", {})
+    finally:
+        ws.close()
+    return result["pages"]
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def summarize(runs):
+    by_page = {}
+    by_figure = {}
+    for run in runs:
+        page = by_page.setdefault(run["page"], {"render_s": [], "first_element_s": [], "errors": 0})
+        page["render_s"].append(run["render_s"])
+        if run["first_element_s"] is not None:
+            page["first_element_s"].append(run["first_element_s"])
+        page["errors"] += run["errors"]
+        for fig_id, seconds in run["figures"].items():
+            by_figure.setdefault(fig_id, []).append(seconds)
+
+    return {
+        "pages": {
+            name: {
+                "runs": len(stats["render_s"]),
+                "errors": stats["errors"],
+                "first_element_p50_s": _percentile(stats["first_element_s"], 0.5),
+                "render_p50_s": _percentile(stats["render_s"], 0.5),
+                "render_p95_s": _percentile(stats["render_s"], 0.95),
+            }
+            for name, stats in by_page.items()
+        },
+        "figures": {
+            fig_id: {"p50_s": _percentile(values, 0.5), "p95_s": _percentile(values, 0.95)}
+            for fig_id, values in sorted(by_figure.items())
+        },
+    }
+
+
+async def run_mode(port, pid, pages, sessions, rounds, clear_cache):
+    sampler = ProcessSampler(pid)
+    cpu_before = sampler.cpu_seconds()
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(run_session(port, pages, rounds, clear_cache) for _ in range(sessions)))
+    finally:
+        sampler.stop()
+
+    summary = summarize([run for session in results for run in session])
+    summary["wall_s"] = time.perf_counter() - start
+    summary["server_cpu_s"] = sampler.cpu_seconds() - cpu_before
+    summary["server_peak_rss_mb"] = sampler.peak_rss / 2**20
+    return summary
+
+
+def print_summary(mode, summary):
+    print(f"\n== {mode}: wall {summary['wall_s']:.1f} s, server CPU {summary['server_cpu_s']:.1f} s, "
+          f"peak RSS {summary['server_peak_rss_mb']:.0f} MB")
+    print(f"{'page':<30} {'runs':>5} {'err':>4} {'first p50':>10} {'render p50':>11} {'render p95':>11}")
+    for name, stats in summary["pages"].items():
+        print(f"{name:<30} {stats['runs']:>5} {stats['errors']:>4} {stats['first_element_p50_s']:>9.3f}s "
+              f"{stats['render_p50_s']:>10.3f}s {stats['render_p95_s']:>10.3f}s")
+    for fig_id, stats in summary["figures"].items():
+        print(f"    {fig_id:<26} p50 {stats['p50_s']:.3f}s  p95 {stats['p95_s']:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent sessions")
+    parser.add_argument("--rounds", type=int, default=2, help="times each session walks through every page")
+    parser.add_argument("--modes", nargs="+", choices=["cached", "uncached"], default=["cached", "uncached"])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--json", help="also write the summaries to this file")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(ROOT, shared.DATA_BIG_ZIP)):
+        parser.error(f"{shared.DATA_BIG_ZIP} not found; run benchmarks/synthetic_data.py --out {shared.DATA_BIG_ZIP} first")
+
+    summaries = {}
+    for mode in args.modes:
+        # A fresh server per mode so one run's caches and memory don't leak into the next
+        server = start_server(args.port)
+        try:
+            pages = asyncio.run(discover_pages(args.port))
+            summaries[mode] = asyncio.run(
+                run_mode(args.port, server.pid, pages, args.sessions, args.rounds, clear_cache=mode == "uncached")
+            )
+        finally:
+            server.terminate()
+            server.wait()
+        print_summary(mode, summaries[mode])
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summaries, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""Generate synthetic archives shaped like ``over_one_mil_chars.zip`` for scale testing.
+
+The real Kaggle export is not part of the repository. This writes the columns
+the Arc pages read (class_starting, total_level, race, background,
+subclass_starting, gold, notes_len), with distributions fitted from
+``cleaned_data_DnD_smaller.csv``:
+
+- classes, levels and per-class subclasses (including missing subclasses) are
+  resampled from their empirical frequencies;
+- races and backgrounds follow a Zipf law whose exponent is fitted to the
+  rank-frequency curve, ordered per class by that class's observed counts;
+- gold and notes_len are not in the small dataset, so they use zero-inflated
+  log-normal tails (see GOLD_* and NOTES_* below).
+
+Output is deterministic for a given seed, row count and chunk size. Everything is
+written under ``synthetic/`` unless ``--out`` says otherwise, and existing files
+are only replaced with ``--force``.
+
+    python benchmarks/synthetic_data.py --rows 1000000
+    python benchmarks/synthetic_data.py --rows 1000000 --out over_one_mil_chars.zip
+    python benchmarks/synthetic_data.py --rows 50000000 --format sharded --out synthetic/shards
+"""
+
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import shared  # noqa: E402
+
+COLUMNS = ["class_starting", "total_level", "race", "background", "subclass_starting", "gold", "notes_len"]
+FORMATS = ["csv-zip", "parquet", "sharded"]
+
+# Zero-inflated log-normal tails; the median non-zero gold is ~150 and a few rows per
+# hundred thousand exceed the 350,000 cap used in Arc 3
+GOLD_ZERO_RATE = 0.25
+GOLD_LOG_MEAN = 5.0
+GOLD_LOG_SIGMA = 2.0
+NOTES_ZERO_RATE = 0.4
+NOTES_LOG_MEAN = 5.5
+NOTES_LOG_SIGMA = 1.3
+
+
+def _empirical(values):
+    counts = values.value_counts(dropna=False)
+    return counts.index.to_numpy(dtype=object), (counts / counts.sum()).to_numpy()
+
+
+def _zipf_exponent(counts):
+    # Slope of the log-log rank-frequency curve
+    counts = np.sort(np.asarray(counts, dtype=float))[::-1]
+    ranks = np.arange(1, len(counts) + 1)
+    slope, _ = np.polyfit(np.log(ranks), np.log(counts), 1)
+    return -slope
+
+
+def _zipf_by_class(df, column, classes):
+    global_counts = df[column].value_counts()
+    categories = global_counts.index.to_numpy(dtype=object)
+    weights = np.arange(1, len(categories) + 1, dtype=float) ** -_zipf_exponent(global_counts)
+    weights /= weights.sum()
+
+    # Each class keeps the Zipf weights but ranks categories by its own counts first
+    by_class = {}
+    for cls in classes:
+        class_counts = df.loc[df["class_starting"] == cls, column].value_counts()
+        order = list(class_counts.index) + [c for c in categories if c not in class_counts.index]
+        by_class[cls] = (np.array(order, dtype=object), weights)
+    return by_class
+
+
+def fit_profile(csv_path=os.path.join(ROOT, shared.DATA_SMALL_CSV)):
+    df = pd.read_csv(csv_path, usecols=["justClass", "subclass", "level", "race", "background"])
+    df["class_starting"] = df["justClass"].str.split("|").str[0]
+    df["subclass_starting"] = df["subclass"].str.split("|").str[0]
+    df = df.dropna(subset=["class_starting"])
+
+    classes, class_probs = _empirical(df["class_starting"])
+    levels, level_probs = _empirical(df.loc[df["level"].between(1, 20), "level"])
+
+    return {
+        "classes": (classes, class_probs),
+        "levels": (levels.astype(np.int64), level_probs),
+        "race": _zipf_by_class(df.dropna(subset=["race"]), "race", classes),
+        "background": _zipf_by_class(df.dropna(subset=["background"]), "background", classes),
+        "subclass": {cls: _empirical(df.loc[df["class_starting"] == cls, "subclass_starting"]) for cls in classes},
+    }
+
+
+def _zero_inflated_lognormal(rng, n, zero_rate, log_mean, log_sigma):
+    values = np.rint(rng.lognormal(log_mean, log_sigma, n)).astype(np.int64)
+    values[rng.random(n) < zero_rate] = 0
+    return values
+
+
+def _per_class(rng, class_codes, classes, distributions):
+    # One vectorized draw per class instead of one per row
+    out = np.empty(len(class_codes), dtype=object)
+    for code, cls in enumerate(classes):
+        rows = np.flatnonzero(class_codes == code)
+        if len(rows):
+            categories, probs = distributions[cls]
+            out[rows] = categories[rng.choice(len(categories), size=len(rows), p=probs)]
+    return out
+
+
+def _categories(distributions):
+    values = {value for categories, _ in distributions.values() for value in categories if pd.notna(value)}
+    return pd.CategoricalDtype(sorted(values))
+
+
+def generate_chunk(rng, profile, n):
+    classes, class_probs = profile["classes"]
+    class_codes = rng.choice(len(classes), size=n, p=class_probs)
+    levels, level_probs = profile["levels"]
+
+    # Fixed category sets keep every chunk's schema identical
+    return pd.DataFrame({
+        "class_starting": pd.Categorical(classes[class_codes], categories=sorted(classes)),
+        "total_level": rng.choice(levels, size=n, p=level_probs),
+        "race": pd.Categorical(
+            _per_class(rng, class_codes, classes, profile["race"]), dtype=_categories(profile["race"])
+        ),
+        "background": pd.Categorical(
+            _per_class(rng, class_codes, classes, profile["background"]), dtype=_categories(profile["background"])
+        ),
+        "subclass_starting": pd.Categorical(
+            _per_class(rng, class_codes, classes, profile["subclass"]), dtype=_categories(profile["subclass"])
+        ),
+        "gold": _zero_inflated_lognormal(rng, n, GOLD_ZERO_RATE, GOLD_LOG_MEAN, GOLD_LOG_SIGMA),
+        "notes_len": _zero_inflated_lognormal(rng, n, NOTES_ZERO_RATE, NOTES_LOG_MEAN, NOTES_LOG_SIGMA),
+    }, columns=COLUMNS)
+
+
+def generate(rows, seed=0, chunk_rows=1_000_000, profile=None):
+    """Yield DataFrame chunks totalling ``rows`` rows."""
+    profile = profile or fit_profile()
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk_rows):
+        yield generate_chunk(rng, profile, min(chunk_rows, rows - start))
+
+
+def write_csv_zip(chunks, path):
+    member = os.path.splitext(os.path.basename(path))[0] + ".csv"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open(member, "w", force_zip64=True) as raw:
+            text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(text, header=i == 0, index=False)
+            text.flush()
+            text.detach()
+
+
+def write_parquet(chunks, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_sharded(chunks, directory):
+    # Shards go to a staging directory that replaces the old one whole, so a smaller
+    # --force run never leaves extra parts from a bigger run behind
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".shards-", dir=parent)
+    try:
+        for i, chunk in enumerate(chunks):
+            chunk.to_parquet(os.path.join(staging, f"part-{i:05d}.parquet"), index=False)
+    except BaseException:
+        shutil.rmtree(staging)
+        raise
+
+    if os.path.exists(directory):
+        retired = f"{staging}-old"
+        os.replace(directory, retired)
+        shutil.rmtree(retired)
+    os.replace(staging, directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=FORMATS, default="csv-zip")
+    parser.add_argument("--out", help="output path (default: under synthetic/)")
+    parser.add_argument("--force", action="store_true", help="replace an existing output")
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000, help="rows per chunk, row group or shard")
+    args = parser.parse_args()
+
+    default_out = {
+        "csv-zip": os.path.join(ROOT, "synthetic", shared.DATA_BIG_ZIP),
+        "parquet": os.path.join(ROOT, "synthetic", "over_one_mil_chars.parquet"),
+        "sharded": os.path.join(ROOT, "synthetic", "shards"),
+    }
+    out = args.out or default_out[args.format]
+    if os.path.exists(out) and not args.force:
+        parser.error(f"{out} already exists; pass --force to replace it")
+    if args.format != "sharded":
+        os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+
+    writer = {"csv-zip": write_csv_zip, "parquet": write_parquet, "sharded": write_sharded}[args.format]
+
+    start = time.perf_counter()
+    writer(generate(args.rows, seed=args.seed, chunk_rows=args.chunk_rows), out)
+    print(f"wrote {args.rows:,} rows to {out} in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
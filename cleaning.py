@@ -0,0 +1,175 @@
+"""Reproducible cleaning stage for the Reddit-sourced character export.
+
+Streams the raw CSV in chunks and applies, in order:
+
+- ``schema``: drop rows without a ``hash`` or ``justClass``, or with
+  non-numeric stats;
+- ``normalize``: tidy ``processedRace`` and ``processedSpells`` (removes nothing);
+- ``duplicate_hash``: drop rows whose ``hash`` was already seen;
+- ``duplicate_character``: drop rows whose (``finger``, ``name``) pair was
+  already seen, i.e. the same player re-uploading the same character.
+
+Duplicate keys are reduced to 64-bit hashes and kept in a few sorted runs, so
+memory is one chunk plus 8 bytes for every distinct key seen so far; it grows
+with the number of distinct rows rather than staying fixed. The output
+has the same columns as the input: CSV like ``cleaned_data_DnD_smaller.csv``,
+or Parquet when the output path ends in ``.parquet``.
+
+    python cleaning.py raw_characters.csv --output cleaned_data_DnD_smaller.csv
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import shared
+
+REQUIRED_COLUMNS = ["hash", "finger", "name", "justClass", "processedRace", "processedSpells"]
+NUMERIC_COLUMNS = ["level", "HP", "AC", "Str", "Dex", "Con", "Int", "Wis", "Cha"]
+RULES = ["schema", "normalize", "duplicate_hash", "duplicate_character"]
+
+
+def validate_schema(columns):
+    missing = [column for column in REQUIRED_COLUMNS + NUMERIC_COLUMNS if column not in columns]
+    if missing:
+        raise ValueError(f"input is missing required columns: {', '.join(missing)}")
+
+
+def _schema(chunk):
+    numeric = chunk[NUMERIC_COLUMNS].apply(pd.to_numeric, errors="coerce")
+
+    # Fractional stats like HP 12.5 are hand-edited sheets; drop them rather than fail the cast
+    valid = chunk["hash"].notna() & chunk["justClass"].notna() & (numeric % 1 == 0).all(axis=1)
+    chunk = chunk[valid].copy()
+    chunk[NUMERIC_COLUMNS] = numeric[valid].astype("Int64")
+    return chunk
+
+
+def _normalize(chunk):
+    chunk["processedRace"] = chunk["processedRace"].str.strip().str.title()
+
+    # "Fire Bolt * 0|*|Shield*1" -> "Fire Bolt*0|Shield*1"; placeholder entries are dropped
+    spells = chunk["processedSpells"].str.split("|").explode()
+    spells = spells.dropna().str.replace(r"\s*\*\s*", "*", regex=True).str.strip()
+    spells = spells[(spells != "") & ~spells.str.startswith("*")]
+    chunk["processedSpells"] = spells.groupby(level=0).agg("|".join).reindex(chunk.index)
+    return chunk
+
+
+class _SeenKeys:
+    """64-bit key hashes seen in earlier chunks, held as sorted runs of decreasing size."""
+
+    def __init__(self):
+        self.runs = []
+
+    def _contains(self, keys):
+        # Probing with sorted keys walks each run in order, which is much friendlier to the cache
+        order = np.argsort(keys)
+        probes = keys[order]
+        found = np.zeros(len(keys), dtype=bool)
+        for run in self.runs:
+            positions = np.minimum(np.searchsorted(run, probes), len(run) - 1)
+            found |= run[positions] == probes
+
+        seen = np.empty(len(keys), dtype=bool)
+        seen[order] = found
+        return seen
+
+    def _add(self, keys):
+        if not len(keys):
+            return
+        self.runs.append(np.sort(keys))
+
+        # Merge runs of similar size, like carrying in a binary counter, so there are only
+        # O(log n) runs and each key is merged O(log n) times. The runs hold disjoint keys and
+        # timsort merges two sorted runs in linear time.
+        while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+            last = self.runs.pop()
+            self.runs[-1] = np.sort(np.concatenate([self.runs[-1], last]), kind="stable")
+
+    def drop_seen(self, chunk, columns):
+        # Rows missing part of the key can't be matched, so they are always kept
+        complete = chunk[columns].notna().all(axis=1).to_numpy()
+        keys = pd.util.hash_pandas_object(chunk[columns], index=False).to_numpy()
+
+        duplicate = complete & (self._contains(keys) | pd.Series(keys).duplicated().to_numpy())
+        self._add(keys[complete & ~duplicate])
+        return chunk[~duplicate]
+
+
+def clean(chunks):
+    """Yield cleaned chunks; the returned report fills in as the generator is consumed."""
+    report = {rule: {"removed": 0, "seconds": 0.0} for rule in RULES}
+    report["rows_in"] = report["rows_out"] = 0
+    seen_hashes, seen_characters = _SeenKeys(), _SeenKeys()
+
+    steps = [
+        ("schema", _schema),
+        ("normalize", _normalize),
+        ("duplicate_hash", lambda chunk: seen_hashes.drop_seen(chunk, ["hash"])),
+        ("duplicate_character", lambda chunk: seen_characters.drop_seen(chunk, ["finger", "name"])),
+    ]
+
+    def run():
+        for chunk in chunks:
+            validate_schema(chunk.columns)
+            report["rows_in"] += len(chunk)
+            for rule, step in steps:
+                start = time.perf_counter()
+                rows = len(chunk)
+                chunk = step(chunk)
+                report[rule]["removed"] += rows - len(chunk)
+                report[rule]["seconds"] += time.perf_counter() - start
+            report["rows_out"] += len(chunk)
+            yield chunk
+
+    return run(), report
+
+
+def _write(chunks, path):
+    if path.endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                # Pin text columns to string so an all-empty column doesn't change the schema mid-file
+                text_columns = {column: "string" for column in chunk.columns if column not in NUMERIC_COLUMNS}
+                table = pa.Table.from_pandas(chunk.astype(text_columns), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(f, header=i == 0, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="raw export (CSV, optionally compressed)")
+    parser.add_argument("--output", default=shared.DATA_SMALL_CSV, help="cleaned CSV or .parquet path")
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    if os.path.abspath(args.input) == os.path.abspath(args.output):
+        parser.error("refusing to overwrite the input; write to a new path and swap it in")
+
+    start = time.perf_counter()
+    chunks, report = clean(pd.read_csv(args.input, chunksize=args.chunk_rows, dtype=str, keep_default_na=True))
+    _write(chunks, args.output)
+
+    print(f"{report['rows_in']:,} rows in, {report['rows_out']:,} rows out in {time.perf_counter() - start:.1f} s")
+    for rule in RULES:
+        print(f"    {rule:<20} removed {report[rule]['removed']:>10,}   {report[rule]['seconds'] * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -50,23 +50,8 @@ like spell choice, that reveal what makes each class distinct.
 
 st.header("D&D Spellcasting Classes")
 
-# Row 1
-col1, col2, col3 = st.columns(3)
-with col1:
-    st.image(shared.IMAGE_FILES[0], caption="", use_container_width=True)
-with col2:
-    st.image(shared.IMAGE_FILES[1], caption="", use_container_width=True)
-with col3:
-    st.image(shared.IMAGE_FILES[2], caption="", use_container_width=True)
-
-# Row 2
-col4, col5, col6 = st.columns(3)
-with col4:
-    st.image(shared.IMAGE_FILES[3], caption="", use_container_width=True)
-with col5:
-    st.image(shared.IMAGE_FILES[4], caption="", use_container_width=True)
-with col6:
-    st.image(shared.IMAGE_FILES[5], caption="", use_container_width=True)
+# All six class icons are served as one responsive grid image
+shared.show_image(shared.CLASS_SPRITE, alt="Bard, Cleric, Druid, Sorcerer, Warlock and Wizard")
 
 st.subheader("Unveiling the Magic: Why Data Visualization Matters")
 
@@ -0,0 +1,73 @@
+import json
+
+import pandas as pd
+
+import shared
+
+# Natural Earth 1:110m countries, simplified and pre-projected by build_country_shapes
+COUNTRY_SHAPES = "world_countries_110m.geojson"
+
+# Equal Earth, rescaled so x spans +/-180; plotly's equirectangular projection then draws it unchanged
+PROJECTION = "EPSG:8857"
+SIMPLIFY_TOLERANCE_M = 20_000
+GRID_SIZE = 0.05
+
+# Countries with fewer characters are left out of the per-class maps
+MIN_CHARACTERS = 10
+
+
+def _round_coordinates(coordinates):
+    # Grid snapping leaves float noise like 22.450000000000003 in the JSON text
+    if isinstance(coordinates[0], (int, float)):
+        return [round(value, 2) for value in coordinates]
+    return [_round_coordinates(part) for part in coordinates]
+
+
+def build_country_shapes(source, output=COUNTRY_SHAPES, code_column="ISO_A2_EH", name_column="NAME"):
+    """Write the compact country GeoJSON from a Natural Earth admin-0 file (run once, offline)."""
+    import geopandas as gpd
+
+    world = gpd.read_file(source)
+    world = world[world[name_column] != "Antarctica"].to_crs(PROJECTION)
+    world["geometry"] = world.geometry.simplify(SIMPLIFY_TOLERANCE_M, preserve_topology=True)
+
+    minx, _, maxx, _ = world.total_bounds
+    scale = 180 / max(abs(minx), abs(maxx))
+    world["geometry"] = world.geometry.scale(scale, scale, origin=(0, 0)).set_precision(GRID_SIZE)
+
+    world = world.rename(columns={code_column: "code", name_column: "name"})[["code", "name", "geometry"]]
+    shapes = json.loads(world.to_json(drop_id=True))
+    shapes.pop("crs", None)
+    for feature in shapes["features"]:
+        feature["geometry"]["coordinates"] = _round_coordinates(feature["geometry"]["coordinates"])
+    with open(output, "w") as f:
+        json.dump(shapes, f, separators=(",", ":"))
+
+
+def load_country_shapes(path=COUNTRY_SHAPES):
+    with open(path) as f:
+        return json.load(f)
+
+
+def country_rollup(df):
+    """One row per country code: characters, top class and spell, and each spellcaster's share."""
+    df = df.dropna(subset=["countryCode"])
+
+    counts = pd.crosstab(df["countryCode"], df["justClass"])
+    characters = counts.sum(axis=1)
+    table = pd.DataFrame({
+        "country": df.groupby("countryCode")["country"].agg(lambda names: names.mode().iat[0]),
+        "characters": characters,
+        "top_class": counts.idxmax(axis=1),
+    })
+
+    shares = counts.reindex(columns=shared.SELECTED_CLASSES, fill_value=0).div(characters, axis=0) * 100
+    table = table.join(shares.add_suffix(" %"))
+
+    # Most common spell per country from one exploded pass over every spell list
+    spells = shared.explode_list(df["processedSpells"], strip_suffix=True)
+    spell_counts = pd.DataFrame({"countryCode": df.loc[spells.index, "countryCode"], "spell": spells})
+    spell_counts = spell_counts.groupby(["countryCode", "spell"]).size().sort_values(ascending=False)
+    table["top_spell"] = spell_counts.reset_index().drop_duplicates("countryCode").set_index("countryCode")["spell"]
+
+    return table.sort_values("characters", ascending=False)
@@ -1,6 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
 import shared
 
@@ -8,50 +6,61 @@ shared.apply_theme()
 
 st.header("Arc 3: Arcane Intricacies")
 
-st.write("""Beyond character creation, how do spellcasters function in play? From gold distribution to notes, these insights reveal what players prioritize and document.""")
+st.write("""Beyond character creation, how do spellcasters function in play? From gold distribution to notes and ability scores, these insights reveal what players prioritize and document.""")
 
 # -----------------------------------------------------------
 # FIGURE 7 - GOLD
 # -----------------------------------------------------------
 
-# Load dataset
-df = pd.read_csv(shared.DATA_BIG_ZIP, usecols=["class_starting", "gold"])
-
-# Filter for spellcasting classes
-df_filtered = df[df["class_starting"].isin(shared.SELECTED_CLASSES)]
-
-# Remove extreme values
-df_filtered = df_filtered[(df_filtered["gold"] > 0) & (df_filtered["gold"] < 350_000)]
-
-# Directly calculate the average gold per class
-df_avg_gold = df_filtered.groupby("class_starting", as_index=False)["gold"].mean()
-
-# Rename column for clarity
-df_avg_gold.rename(columns={"gold": "Average Gold"}, inplace=True)
-
-# Bar chart of average gold per class
-fig = px.bar(
-    df_avg_gold,
-    x="class_starting",
-    y="Average Gold",
-    title="Average Gold per Spellcasting Class",
-    labels={"class_starting": "Class", "Average Gold": "Gold (Avg)"},
-    color="class_starting",
-    color_discrete_map=shared.CLASS_COLORS,
-)
-
-# Modify layout
-fig.update_layout(
-    width=700,
-    height=600,
-    xaxis_title="Character Class",
-    yaxis_title="Average Gold",
-    title_font_size=18,
-)
+def build_gold_figure():
+    import pandas as pd
+    import plotly.express as px
+
+    # Load dataset
+    df = pd.read_csv(shared.DATA_BIG_ZIP, usecols=["class_starting", "gold"])
+
+    # Filter for spellcasting classes
+    df_filtered = df[df["class_starting"].isin(shared.SELECTED_CLASSES)]
+
+    # Remove extreme values
+    df_filtered = df_filtered[(df_filtered["gold"] > 0) & (df_filtered["gold"] < 350_000)]
+
+    # Directly calculate the average gold per class
+    df_avg_gold = df_filtered.groupby("class_starting", as_index=False)["gold"].mean()
+
+    # Rename column for clarity
+    df_avg_gold.rename(columns={"gold": "Average Gold"}, inplace=True)
+
+    # Bar chart of average gold per class
+    fig = px.bar(
+        df_avg_gold,
+        x="class_starting",
+        y="Average Gold",
+        title="Average Gold per Spellcasting Class",
+        labels={"class_starting": "Class", "Average Gold": "Gold (Avg)"},
+        color="class_starting",
+        color_discrete_map=shared.CLASS_COLORS,
+    )
+
+    # Modify layout
+    fig.update_layout(
+        width=700,
+        height=600,
+        xaxis_title="Character Class",
+        yaxis_title="Average Gold",
+        title_font_size=18,
+    )
+    return fig
+
 
 # Show chart
 with st.expander("Average Gold per Spellcasting Class"):
-    st.plotly_chart(fig, use_container_width=True)
+    shared.render_figure(
+        "arc3-gold",
+        build_gold_figure,
+        fingerprint=shared.data_fingerprint(shared.DATA_BIG_ZIP),
+        use_container_width=True,
+    )
 
 st.subheader("Context & Insights:")
 
@@ -75,55 +84,66 @@ st.write("""
 # FIGURE 8 - NOTES
 # -----------------------------------------------------------
 
-# Load dataset
-df = pd.read_csv(shared.DATA_BIG_ZIP, usecols=["class_starting", "notes_len"])
-
-# Filter for only six spellcasting classes
-df_filtered = df[df["class_starting"].isin(shared.SELECTED_CLASSES)]
-
-# Remove entries where 'notes_len' is 0
-df_filt_nonzero = df_filtered[df_filtered["notes_len"] > 0]
-
-# Calculate average note length per class
-avg_note_length_per_class = df_filt_nonzero.groupby("class_starting")["notes_len"].mean().reset_index()
-
-# Create interactive lollipop chart
-fig = px.scatter(
-    avg_note_length_per_class,
-    x="class_starting",
-    y="notes_len",
-    text=avg_note_length_per_class["notes_len"].round(1),
-    color="class_starting",
-    color_discrete_map=shared.CLASS_COLORS,
-    title="Average Note Length per Spellcasting Class",
-    labels={"class_starting": "Class", "notes_len": "Average Note Length"},
-)
-
-# Add sticks for lollipop effect
-for _, row in avg_note_length_per_class.iterrows():
-    fig.add_shape(
-        type="line",
-        x0=row["class_starting"],
-        x1=row["class_starting"],
-        y0=0,
-        y1=row["notes_len"],
-        line=dict(color="gray", width=2),
+def build_notes_figure():
+    import pandas as pd
+    import plotly.express as px
+
+    # Load dataset
+    df = pd.read_csv(shared.DATA_BIG_ZIP, usecols=["class_starting", "notes_len"])
+
+    # Filter for only six spellcasting classes
+    df_filtered = df[df["class_starting"].isin(shared.SELECTED_CLASSES)]
+
+    # Remove entries where 'notes_len' is 0
+    df_filt_nonzero = df_filtered[df_filtered["notes_len"] > 0]
+
+    # Calculate average note length per class
+    avg_note_length_per_class = df_filt_nonzero.groupby("class_starting")["notes_len"].mean().reset_index()
+
+    # Create interactive lollipop chart
+    fig = px.scatter(
+        avg_note_length_per_class,
+        x="class_starting",
+        y="notes_len",
+        text=avg_note_length_per_class["notes_len"].round(1),
+        color="class_starting",
+        color_discrete_map=shared.CLASS_COLORS,
+        title="Average Note Length per Spellcasting Class",
+        labels={"class_starting": "Class", "notes_len": "Average Note Length"},
     )
 
-# Modify layout for readability
-fig.update_traces(marker=dict(size=15, line=dict(width=2, color="black")), textposition="top center")
-fig.update_layout(
-    xaxis_title="Class",
-    yaxis_title="Average Note Length",
-    xaxis_tickangle=-25,
-    height=600,
-    width=700,
-    showlegend=False,
-)
+    # Add sticks for lollipop effect
+    for _, row in avg_note_length_per_class.iterrows():
+        fig.add_shape(
+            type="line",
+            x0=row["class_starting"],
+            x1=row["class_starting"],
+            y0=0,
+            y1=row["notes_len"],
+            line=dict(color="gray", width=2),
+        )
+
+    # Modify layout for readability
+    fig.update_traces(marker=dict(size=15, line=dict(width=2, color="black")), textposition="top center")
+    fig.update_layout(
+        xaxis_title="Class",
+        yaxis_title="Average Note Length",
+        xaxis_tickangle=-25,
+        height=600,
+        width=700,
+        showlegend=False,
+    )
+    return fig
+
 
 # Show chart
 with st.expander("Average Note Length per Spellcasting Class"):
-    st.plotly_chart(fig, use_container_width=True)
+    shared.render_figure(
+        "arc3-notes",
+        build_notes_figure,
+        fingerprint=shared.data_fingerprint(shared.DATA_BIG_ZIP),
+        use_container_width=True,
+    )
 
 st.subheader("Context & Insights:")
 
@@ -143,3 +163,101 @@ st.write("""
 - **Averages:** Computed mean note length by class.
 - **Lollipop Layout:** Combined a scatter plot with vertical lines.
 """)
+
+# -----------------------------------------------------------
+# FIGURE 9 - ABILITY SCORES
+# -----------------------------------------------------------
+
+@st.cache_data(show_spinner="Summarizing class stats...")
+def load_stat_summary(fingerprint):
+    import pandas as pd
+
+    import stat_analytics
+
+    # Load dataset
+    df = pd.read_csv(shared.DATA_SMALL_CSV, usecols=["justClass", "castingStat"] + stat_analytics.STAT_COLUMNS)
+
+    # Per-class means, quantiles, correlations and casting-stat match rate in one pass
+    return stat_analytics.class_stat_summary(df)
+
+
+stats_fingerprint = shared.data_fingerprint(shared.DATA_SMALL_CSV)
+
+
+def build_stat_heatmap_figure():
+    import plotly.graph_objects as go
+
+    summary = load_stat_summary(stats_fingerprint)
+    means = summary["means"]
+
+    # Color by how far each class sits from the spellcaster average, in standard deviations;
+    # a lone class (std NaN) or a stat every class shares (std 0) stays at the midpoint
+    spread = means.std().fillna(0).replace(0, 1)
+    z_scores = (means - means.mean()) / spread
+
+    # Label each class with how often it casts with its expected stat
+    class_labels = [
+        f"{cls} ({shared.CLASS_CASTING_STAT[cls]} {summary['casting_match'][cls]:.0%})" for cls in means.index
+    ]
+
+    fig = go.Figure(
+        go.Heatmap(
+            z=z_scores.to_numpy(),
+            x=means.columns,
+            y=class_labels,
+            text=means.round(1).to_numpy(),
+            texttemplate="%{text}",
+            hovertemplate="%{y}<br>%{x}: %{text}<extra></extra>",
+            colorscale="RdBu_r",
+            zmid=0,
+            colorbar=dict(title="Std. Dev. from<br>Average"),
+        )
+    )
+
+    fig.update_layout(
+        title="Average Ability Scores, HP, AC and Level per Spellcasting Class",
+        xaxis_title="Stat",
+        yaxis_title="Class (Casting Stat Match Rate)",
+        height=600,
+        width=900,
+    )
+    return fig
+
+
+with st.expander("Average Ability Scores per Spellcasting Class"):
+    summary = load_stat_summary(stats_fingerprint)
+    if summary["means"].empty:
+        st.info("No spellcasting characters with valid stats in the current dataset.")
+    else:
+        shared.render_figure(
+            "arc3-stats",
+            build_stat_heatmap_figure,
+            fingerprint=stats_fingerprint,
+            use_container_width=True,
+        )
+
+        # Spread and correlations for one class at a time, from the same cached summary
+        stat_class = st.selectbox("Class details", summary["means"].index)
+        st.write(f"**{stat_class}: 25th, 50th and 75th Percentiles**")
+        st.dataframe(summary["quantiles"].loc[stat_class].rename(index=lambda q: f"{q:.0%}"), use_container_width=True)
+        st.write(f"**{stat_class}: Correlation Between Stats**")
+        st.dataframe(summary["correlations"][stat_class].round(2), use_container_width=True)
+
+st.subheader("Context & Insights:")
+
+st.write("""
+This heatmap shows the **average stats** for each spellcasting class from the smaller dataset. Each cell shows the raw average and is colored by how far that class sits above or below the other spellcasters. The tables below it show one class's percentiles and how its stats move together.
+
+#### Key Observations:
+- **Casting Stats Lead:** Every class peaks in its own casting stat: Charisma for Bards, Sorcerers, and Warlocks, Wisdom for Clerics and Druids, and Intelligence for Wizards.
+- **Clerics Dress for Battle:** Clerics carry the highest Strength and AC, matching their heavy-armor frontline role.
+- **Dexterity as a Backup:** Lightly armored casters lean on Dexterity for defense.
+""")
+
+st.subheader("Relevant Transformations:")
+
+st.write("""
+- **Filtering Impossible Sheets:** Dropped ability scores outside 1-30, non-positive HP, and levels above 20.
+- **Single-Pass Aggregation:** Means, quantiles, and correlations were computed per class in one sorted pass and cached until the dataset changes.
+- **Casting Stat Match:** Compared each character's `castingStat` to the class's expected spellcasting ability.
+""")
@@ -0,0 +1,120 @@
+import time
+
+import streamlit as st
+
+import shared
+
+shared.apply_theme()
+
+st.header("Find Builds Like Mine")
+
+st.write("""Every character in the smaller dataset is a bundle of choices: class, race, background, subclass, spells, and ability scores. Pick a character or describe your own,
+and this page finds the characters whose builds are closest to it.""")
+
+
+@st.cache_resource(show_spinner="Loading the character index...", max_entries=1)
+def load_characters(fingerprint):
+    import similarity
+
+    # The fingerprint argument reloads the index whenever the dataset is replaced
+    return similarity.load_or_build()
+
+
+def find_similar(query, k):
+    import pandas as pd
+
+    import similarity
+
+    if isinstance(query, dict):
+        query = pd.DataFrame([query])
+
+    start = time.perf_counter()
+    ids, similarities = similarity.search(index, similarity.encode(query[similarity.FEATURE_COLUMNS], encoder), k=k)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    # Approximate search pads with -1 when the probed clusters hold fewer than k characters
+    found = ids[0] >= 0
+    return ids[0][found], similarities[0][found], elapsed_ms
+
+
+df, index, encoder = load_characters(shared.data_fingerprint(shared.DATA_SMALL_CSV))
+
+# -----------------------------------------------------------
+# QUERY
+# -----------------------------------------------------------
+
+mode = st.radio("Start from", ["An existing character", "My own build"], horizontal=True)
+
+if mode == "An existing character":
+    labels = (df["Alias"].fillna("unnamed") + " - " + df["processedRace"].fillna("?") + " " + df["justClass"].fillna("?")).tolist()
+    row = st.selectbox("Character", range(len(df)), format_func=lambda i: labels[i])
+    query = df.iloc[[row]]
+else:
+    col1, col2 = st.columns(2)
+    with col1:
+        classes = sorted(df["justClass"].dropna().unique())
+        cls = st.selectbox("Class", classes, index=classes.index("Wizard"))
+        subclasses = sorted(df.loc[df["justClass"] == cls, "subclass"].dropna().unique())
+        subclass = st.selectbox("Subclass", [""] + subclasses)
+        race = st.selectbox("Race", sorted(df["processedRace"].dropna().unique()))
+        background = st.selectbox("Background", sorted(df["background"].dropna().unique()))
+        level = st.slider("Level", 1, 20, 5)
+    with col2:
+        scores = {stat: st.slider(stat, 3, 20, 10) for stat in ["Str", "Dex", "Con", "Int", "Wis", "Cha"]}
+
+    casting_stat = st.selectbox("Casting stat", ["Int", "Wis", "Cha"])
+    hp, ac = st.columns(2)
+    with hp:
+        hit_points = st.number_input("HP", min_value=1, value=8 * level)
+    with ac:
+        armor_class = st.number_input("AC", min_value=1, value=12)
+    spells = st.multiselect("Spells", encoder["vocab"]["processedSpells"])
+
+    query = {
+        **scores,
+        "HP": hit_points,
+        "AC": armor_class,
+        "level": level,
+        "justClass": cls,
+        "castingStat": casting_stat,
+        "processedRace": race,
+        "background": background,
+        "subclass": subclass,
+        "processedSpells": "|".join(spells),
+    }
+
+k = st.slider("How many similar builds", 5, 50, 10)
+
+# -----------------------------------------------------------
+# RESULTS
+# -----------------------------------------------------------
+
+ids, similarities, elapsed_ms = find_similar(query, k + 1)
+
+results = df.loc[ids, ["Alias", "justClass", "subclass", "processedRace", "background", "level"]].copy()
+results["Similarity"] = similarities
+if mode == "An existing character":
+    # The character itself is always its own closest match
+    results = results.drop(index=df.index[row], errors="ignore")
+results = results.head(k).rename(columns={
+    "Alias": "Character",
+    "justClass": "Class",
+    "subclass": "Subclass",
+    "processedRace": "Race",
+    "background": "Background",
+    "level": "Level",
+})
+
+st.subheader("Closest Builds")
+st.dataframe(results, hide_index=True, use_container_width=True)
+st.caption(f"Searched {len(df):,} characters in {elapsed_ms:.1f} ms.")
+
+st.subheader("How Similarity Is Measured:")
+
+st.write("""
+- **Ability Scores, HP, AC and Level:** Clipped to the 1st-99th percentile and standardized, so a min-maxed build stays far from an average one.
+- **Class, Race and Casting Stat:** One-hot encoded; multiclass characters count toward each class.
+- **Background and Subclass:** Hashed into a fixed number of buckets to absorb free-text variants.
+- **Spells:** One column per known spell.
+- **Cosine Similarity:** The stat group and each categorical group carry roughly equal weight, and the closest characters by cosine similarity are returned.
+""")
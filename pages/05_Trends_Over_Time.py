@@ -0,0 +1,206 @@
+import streamlit as st
+
+import shared
+
+shared.apply_theme()
+
+st.header("Trends Over Time")
+
+st.write("""Every character in the smaller dataset carries the date it was saved, from spring 2018 to summer 2022. Do new sourcebooks shift which classes, spells, and races
+players reach for? These charts follow popularity month by month.""")
+
+
+@st.cache_data(show_spinner="Updating monthly rollups...")
+def load_trend_rollups(fingerprint):
+    import trends
+
+    # Skipped entirely while the CSV is unchanged; otherwise only months whose rows changed are recomputed
+    trends.update_rollups()
+    return trends.load_rollups()
+
+
+fingerprint = shared.data_fingerprint(shared.DATA_SMALL_CSV)
+rollups = load_trend_rollups(fingerprint)
+months = sorted(rollups["class_month"]["period"].dt.strftime("%Y-%m").unique())
+
+# -----------------------------------------------------------
+# TIME RANGE
+# -----------------------------------------------------------
+
+start, end = st.select_slider("Time range", options=months, value=(months[0], months[-1]))
+granularity = st.radio("Group classes by", ["Month", "Week"], horizontal=True)
+params = {"start": start, "end": end}
+
+
+def _add_releases(fig, start, end):
+    import pandas as pd
+
+    import trends
+
+    for book, released in trends.SOURCEBOOK_RELEASES.items():
+        released = pd.Timestamp(released)
+        if pd.Timestamp(start) <= released <= pd.Timestamp(end) + pd.offsets.MonthEnd(1):
+            fig.add_vline(x=released, line=dict(color="gray", dash="dot", width=1))
+            fig.add_annotation(
+                x=released,
+                y=1,
+                yref="paper",
+                text=book,
+                showarrow=False,
+                textangle=-90,
+                xanchor="right",
+                yanchor="top",
+                font_size=10,
+            )
+
+
+# -----------------------------------------------------------
+# FIGURE 10 - CLASS POPULARITY
+# -----------------------------------------------------------
+
+def build_class_trend_figure(start, end, granularity):
+    import pandas as pd
+    import plotly.express as px
+
+    import trends
+
+    # Filter the pre-bucketed counts; raw rows are never rescanned
+    rollup = rollups["class_week" if granularity == "Week" else "class_month"]
+    end_bound = pd.Timestamp(end) + pd.offsets.MonthEnd(1)
+    shares = trends.share_over_time(rollup, pd.Timestamp(start), end_bound, keys=shared.SELECTED_CLASSES)
+
+    fig = px.line(
+        shares,
+        x="period",
+        y="share",
+        color="key",
+        title=f"Share of New Characters per Spellcasting Class, by {granularity}",
+        labels={"period": granularity, "share": "Share of Characters (%)", "key": "Class"},
+        color_discrete_map=shared.CLASS_COLORS,
+    )
+
+    _add_releases(fig, start, end)
+    fig.update_layout(height=600, width=1000, legend_title="Class")
+    return fig
+
+
+with st.expander("Spellcasting Class Popularity Over Time", expanded=True):
+    shared.render_figure(
+        "trends-classes",
+        build_class_trend_figure,
+        params={**params, "granularity": granularity},
+        fingerprint=fingerprint,
+        use_container_width=True,
+    )
+
+st.subheader("Context & Insights:")
+
+st.write("""
+This line chart tracks each spellcasting class's share of all characters created in a period. Dotted lines mark major sourcebook releases, which add new subclasses
+and can pull players toward a class.
+
+Weekly buckets hold only a few dozen characters each, so the monthly view is the steadier read.
+""")
+
+# -----------------------------------------------------------
+# FIGURE 11 - SPELL POPULARITY
+# -----------------------------------------------------------
+
+def build_spell_trend_figure(start, end, top_n):
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    import trends
+
+    start, end_bound = pd.Timestamp(start), pd.Timestamp(end) + pd.offsets.MonthEnd(1)
+    spells = rollups["spell_month"]
+    top_spells = trends.top_keys(spells, start, end_bound, top_n)
+
+    # Percent of each month's characters that know the spell
+    characters = rollups["class_month"].groupby("period")["count"].sum()
+    window = spells[(spells["period"] >= start) & (spells["period"] <= end_bound) & spells["key"].isin(top_spells)]
+    grid = window.pivot_table(index="key", columns="period", values="count", fill_value=0).reindex(top_spells)
+    grid = grid.div(characters.reindex(grid.columns).to_numpy()) * 100
+
+    fig = go.Figure(
+        go.Heatmap(
+            z=grid.to_numpy(),
+            x=grid.columns,
+            y=grid.index,
+            colorscale="Blues",
+            colorbar=dict(title="% of<br>Characters"),
+            hovertemplate="%{y}<br>%{x|%b %Y}: %{z:.1f}%<extra></extra>",
+        )
+    )
+    fig.update_layout(
+        title=f"Top {top_n} Spells by Month",
+        xaxis_title="Month",
+        yaxis=dict(autorange="reversed"),
+        height=600,
+        width=1000,
+    )
+    return fig
+
+
+with st.expander("Most Popular Spells Over Time"):
+    top_n = st.slider("Number of spells", 5, 25, 10)
+    shared.render_figure(
+        "trends-spells",
+        build_spell_trend_figure,
+        params={**params, "top_n": top_n},
+        fingerprint=fingerprint,
+        use_container_width=True,
+    )
+
+st.subheader("Context & Insights:")
+
+st.write("""
+This heatmap shows how often the most common spells in the selected range appear, as a percent of the characters created each month. Staples like *Cure Wounds*
+and *Mage Hand* hold steady, while spells introduced by newer books appear only after their release.
+""")
+
+# -----------------------------------------------------------
+# FIGURE 12 - RACE POPULARITY
+# -----------------------------------------------------------
+
+def build_race_trend_figure(start, end):
+    import pandas as pd
+    import plotly.express as px
+
+    import trends
+
+    start_bound, end_bound = pd.Timestamp(start), pd.Timestamp(end) + pd.offsets.MonthEnd(1)
+    races = rollups["race_month"]
+    top_races = trends.top_keys(races, start_bound, end_bound, 6)
+    shares = trends.share_over_time(races, start_bound, end_bound, keys=top_races)
+
+    fig = px.line(
+        shares,
+        x="period",
+        y="share",
+        color="key",
+        title="Share of New Characters for the Six Most Common Races",
+        labels={"period": "Month", "share": "Share of Characters (%)", "key": "Race"},
+    )
+
+    _add_releases(fig, start, end)
+    fig.update_layout(height=600, width=1000, legend_title="Race")
+    return fig
+
+
+with st.expander("Race Popularity Over Time"):
+    shared.render_figure(
+        "trends-races",
+        build_race_trend_figure,
+        params=params,
+        fingerprint=fingerprint,
+        use_container_width=True,
+    )
+
+st.subheader("Relevant Transformations:")
+
+st.write("""
+- **Date Parsing:** Parsed every ISO `date` once and bucketed it by week and month.
+- **Monthly Rollups:** Stored class, race, and spell counts per month on disk. When the dataset changes, every row is re-read and hashed, but only the months whose rows changed are recounted; an unchanged dataset is not read at all.
+- **Range Filtering:** Moving the time range filters the stored counts, never the raw characters.
+""")
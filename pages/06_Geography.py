@@ -0,0 +1,145 @@
+import streamlit as st
+
+import shared
+
+shared.apply_theme()
+
+st.header("Geography")
+
+st.write("""The intro mentions the geography dilemma: most characters come from a handful of countries. The smaller dataset still records where each character
+was saved, so this map shows how far the hobby reaches and where the spellcasting classes lean differently.""")
+
+
+@st.cache_data(show_spinner="Aggregating characters by country...")
+def load_country_rollup(fingerprint):
+    import pandas as pd
+
+    import geography
+
+    df = pd.read_csv(shared.DATA_SMALL_CSV, usecols=["countryCode", "country", "justClass", "processedSpells"])
+    return geography.country_rollup(df)
+
+
+@st.cache_resource
+def load_shapes():
+    import geography
+
+    # Simplified, pre-projected shapes shipped with the app; nothing is fetched at runtime
+    return geography.load_country_shapes()
+
+
+fingerprint = shared.data_fingerprint(shared.DATA_SMALL_CSV)
+countries = load_country_rollup(fingerprint)
+
+# -----------------------------------------------------------
+# FIGURE 13 - CHARACTERS BY COUNTRY
+# -----------------------------------------------------------
+
+metric = st.selectbox("Color countries by", ["Characters"] + [f"{cls} %" for cls in shared.SELECTED_CLASSES])
+
+
+def build_country_figure(metric):
+    import numpy as np
+    import plotly.graph_objects as go
+
+    import geography
+
+    shapes = load_shapes()
+    table = countries
+    if metric != "Characters":
+        # Shares from a handful of characters are noise, so small countries stay grey
+        table = table[table["characters"] >= geography.MIN_CHARACTERS]
+
+    # Each shape goes into exactly one trace so the geometry is only serialized once
+    with_data = [feature for feature in shapes["features"] if feature["properties"]["code"] in table.index]
+    without_data = [feature for feature in shapes["features"] if feature["properties"]["code"] not in table.index]
+    table = table.reindex([feature["properties"]["code"] for feature in with_data])
+
+    if metric == "Characters":
+        z = np.log10(table["characters"])
+        ticks = [1, 10, 100, 1000, 10000]
+        colorbar = dict(title="Characters", tickvals=np.log10(ticks), ticktext=[f"{tick:,}" for tick in ticks])
+        colorscale = "Blues"
+    else:
+        z = table[metric]
+        colorbar = dict(title=f"% {metric[:-2]}")
+        colorscale = [[0, "#f7f7f7"], [1, shared.CLASS_COLORS[metric[:-2]]]]
+
+    fig = go.Figure()
+    fig.add_trace(
+        go.Choropleth(
+            geojson={"type": "FeatureCollection", "features": without_data},
+            featureidkey="properties.code",
+            locations=[feature["properties"]["code"] for feature in without_data],
+            z=np.zeros(len(without_data)),
+            colorscale=[[0, "#d9d9d9"], [1, "#d9d9d9"]],
+            showscale=False,
+            marker_line=dict(color="white", width=0.5),
+            hovertext=[feature["properties"]["name"] for feature in without_data],
+            hovertemplate="%{hovertext}<br>Not enough characters<extra></extra>",
+        )
+    )
+    fig.add_trace(
+        go.Choropleth(
+            geojson={"type": "FeatureCollection", "features": with_data},
+            featureidkey="properties.code",
+            locations=table.index,
+            z=z,
+            colorscale=colorscale,
+            colorbar=colorbar,
+            marker_line=dict(color="white", width=0.5),
+            customdata=table[["characters", "top_class", "top_spell"]].fillna("-").to_numpy(),
+            hovertext=table["country"],
+            hovertemplate=(
+                "<b>%{hovertext}</b><br>Characters: %{customdata[0]:,}<br>Top class: %{customdata[1]}"
+                "<br>Top spell: %{customdata[2]}" + ("" if metric == "Characters" else f"<br>{metric[:-2]}: %{{z:.1f}}%")
+                + "<extra></extra>"
+            ),
+        )
+    )
+
+    # The shapes are already projected, so draw them as flat x/y without plotly's own basemap
+    fig.update_geos(
+        projection_type="equirectangular",
+        fitbounds="geojson",
+        visible=False,
+        showframe=False,
+    )
+    title = "Characters per Country" if metric == "Characters" else f"Share of Characters Playing {metric[:-2]}"
+    fig.update_layout(title=title, height=600, width=1000, margin=dict(l=0, r=0, t=50, b=0))
+    return fig
+
+
+with st.expander("Characters by Country", expanded=True):
+    shared.render_figure(
+        "geo-countries",
+        build_country_figure,
+        params={"metric": metric},
+        fingerprint=fingerprint,
+        use_container_width=True,
+    )
+
+st.subheader("Context & Insights:")
+
+st.write("""
+The United States and Canada account for the large majority of characters, with the United Kingdom a distant third; color is on a log scale so the long tail of
+countries with a few dozen characters stays visible. Switching to a class share shows whether a country's players favor that class more or less than elsewhere,
+for countries with at least ten characters.
+
+Very small countries such as Singapore fall below the resolution of the map, but are still listed in the table.
+""")
+
+with st.expander("Country Table"):
+    st.dataframe(
+        countries.rename_axis("Code").rename(columns={"country": "Country", "characters": "Characters",
+                                                     "top_class": "Top Class", "top_spell": "Top Spell"}),
+        column_config={f"{cls} %": st.column_config.NumberColumn(format="%.1f") for cls in shared.SELECTED_CLASSES},
+    )
+
+st.subheader("Relevant Transformations:")
+
+st.write("""
+- **Country Rollup:** Counted characters, classes, and spells per country code once, cached until the dataset changes.
+- **Simplified Shapes:** Natural Earth country outlines simplified and pre-projected to Equal Earth, stored with the app and loaded once per server.
+- **Single Geometry Payload:** Each country outline is sent to the browser once, in either the data layer or the grey no-data layer.
+""")
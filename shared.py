@@ -1,4 +1,13 @@
+import hashlib
+import os
+import tempfile
+import time
+
 import streamlit as st
+from streamlit.logger import get_logger
+
+# Streamlit's logger honours --logger.level, so figure and image metrics show up in the server log
+logger = get_logger(__name__)
 
 DATA_BIG_ZIP = "over_one_mil_chars.zip"
 DATA_SMALL_CSV = "cleaned_data_DnD_smaller.csv"
@@ -14,6 +23,16 @@ CLASS_COLORS = {
     "Wizard": "#2A50A1",
 }
 
+# Spellcasting ability each class casts with
+CLASS_CASTING_STAT = {
+    "Bard": "Cha",
+    "Cleric": "Wis",
+    "Druid": "Wis",
+    "Sorcerer": "Cha",
+    "Warlock": "Cha",
+    "Wizard": "Int",
+}
+
 IMAGE_FILES = [
     "Bard_DS.png",
     "Cleric_DS.png",
@@ -25,6 +44,14 @@ IMAGE_FILES = [
     "Magic_Missile.png",
 ]
 
+# Resized WebP variants are written here and served by Streamlit's static file handler
+STATIC_IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "img")
+STATIC_IMAGE_URL = "app/static/img"
+IMAGE_WIDTHS = (320, 640, 960, 1280)
+
+# The six class icons composed into a single 3x2 grid image
+CLASS_SPRITE = "class_grid"
+
 
 def apply_theme():
     st.markdown(
@@ -74,3 +101,157 @@ def apply_theme():
 """,
         unsafe_allow_html=True,
     )
+
+
+def data_fingerprint(*paths):
+    # Size + modification time of each source file; changes whenever a dataset is replaced
+    parts = []
+    for path in paths:
+        stat = os.stat(path)
+        parts.append(f"{path}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(parts)
+
+
+def explode_list(series, strip_suffix=False):
+    """One row per entry of a "|"-separated list such as "Sorcerer|Cleric", indexed by the source row.
+
+    With ``strip_suffix``, a "*..." suffix is cut from each entry, so spell lists like
+    "Fire Bolt*0|Shield*1" yield just the spell names. Blank entries are dropped.
+    """
+    values = series.str.split("|").explode()
+    if strip_suffix:
+        values = values.str.split("*").str[0]
+    values = values.str.strip()
+    return values[values.fillna("") != ""]
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _figure_payload(fig_id, params, fingerprint, _build):
+    import plotly.io as pio
+
+    start = time.perf_counter()
+    fig = _build(**params)
+    built = time.perf_counter()
+    payload = pio.to_json(fig, validate=False, engine="orjson").encode()
+    serialized = time.perf_counter()
+    digest = hashlib.sha256(payload).hexdigest()
+
+    # Only logged on a cache miss, when the figure was actually built and serialized
+    logger.info(
+        "figure %s: built in %.1f ms, %d bytes serialized in %.1f ms (sha256 %s)",
+        fig_id,
+        (built - start) * 1000,
+        len(payload),
+        (serialized - built) * 1000,
+        digest[:12],
+    )
+    return {"json": payload, "digest": digest}
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _figure_from_payload(digest, _payload):
+    import plotly.io as pio
+
+    return pio.from_json(_payload, skip_invalid=True)
+
+
+# Pages keep pandas/plotly/numpy imports inside their figure builders, so those libraries
+# only load when a figure actually computes and text renders without them.
+#
+# The cache skips building the figure (data loading, aggregation, plotly construction),
+# not sending it: st.plotly_chart serializes the figure again on every rerun. That
+# per-rerun cost is logged at debug level (--logger.level debug). Plotly's default "auto"
+# JSON engine already picks orjson from requirements.txt for that pass.
+def render_figure(fig_id, build, params=None, fingerprint="", **chart_kwargs):
+    params = params or {}
+    payload = _figure_payload(fig_id, params, fingerprint, build)
+
+    # Keying the element on the content hash keeps it stable in the browser while the payload is unchanged
+    fig = _figure_from_payload(payload["digest"], payload["json"])
+    start = time.perf_counter()
+    st.plotly_chart(fig, key=f"{fig_id}-{payload['digest'][:16]}", **chart_kwargs)
+    logger.debug("figure %s: sent in %.1f ms", fig_id, (time.perf_counter() - start) * 1000)
+
+
+def _class_sprite():
+    from PIL import Image
+
+    icons = [Image.open(path).convert("RGBA") for path in IMAGE_FILES[:6]]
+    cell_width = max(icon.width for icon in icons)
+    cell_height = max(icon.height for icon in icons)
+
+    # Center each icon in its cell, three per row like the original column layout
+    sprite = Image.new("RGBA", (cell_width * 3, cell_height * 2), (0, 0, 0, 0))
+    for i, icon in enumerate(icons):
+        row, col = divmod(i, 3)
+        x = col * cell_width + (cell_width - icon.width) // 2
+        y = row * cell_height + (cell_height - icon.height) // 2
+        sprite.paste(icon, (x, y), icon)
+    return sprite
+
+
+@st.cache_resource(show_spinner=False)
+def image_variants(name):
+    from PIL import Image
+
+    sources = IMAGE_FILES[:6] if name == CLASS_SPRITE else [name]
+
+    # Content hash in the file name, so a changed source image always gets new variant URLs
+    digest = hashlib.sha256()
+    for path in sources:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    stem = f"{os.path.splitext(name)[0]}-{digest.hexdigest()[:10]}"
+
+    image = _class_sprite() if name == CLASS_SPRITE else Image.open(name).convert("RGBA")
+    widths = [width for width in IMAGE_WIDTHS if width < image.width]
+    if image.width <= IMAGE_WIDTHS[-1]:
+        widths.append(image.width)
+
+    try:
+        os.makedirs(STATIC_IMAGE_DIR, exist_ok=True)
+        variants = []
+        for width in widths:
+            filename = f"{stem}-{width}.webp"
+            path = os.path.join(STATIC_IMAGE_DIR, filename)
+            if not os.path.exists(path):
+                height = round(image.height * width / image.width)
+                resized = image.resize((width, height), Image.Resampling.LANCZOS)
+
+                # Write beside the final path and rename, so a crash or a second server never leaves a partial file
+                fd, tmp_path = tempfile.mkstemp(suffix=".webp.tmp", dir=STATIC_IMAGE_DIR)
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        resized.save(f, "WEBP", quality=80, method=6)
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    os.remove(tmp_path)
+                    raise
+
+            # Tornado's static handler sends a ten-year Cache-Control for URLs with a "v" argument;
+            # safe here because the file name changes whenever the image does
+            url = f"{STATIC_IMAGE_URL}/{filename}?v={digest.hexdigest()[:10]}"
+            variants.append((width, url, os.path.getsize(path)))
+    except OSError:
+        logger.warning("could not write image variants for %s; serving the original", name)
+        return []
+
+    logger.info("image %s: %s", name, ", ".join(f"{w}w={size} bytes" for w, _, size in variants))
+    return variants
+
+
+def show_image(name, sizes="(max-width: 768px) 100vw, 736px", alt=""):
+    variants = image_variants(name)
+    if not variants:
+        if name == CLASS_SPRITE:
+            st.image(_class_sprite(), use_container_width=True)
+        else:
+            st.image(name, use_container_width=True)
+        return
+
+    # The browser picks the smallest variant that covers the rendered width
+    srcset = ", ".join(f"{url} {width}w" for width, url, _ in variants)
+    st.markdown(
+        f'<img src="{variants[-1][1]}" srcset="{srcset}" sizes="{sizes}" alt="{alt}" style="width: 100%; height: auto;">',
+        unsafe_allow_html=True,
+    )
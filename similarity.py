@@ -0,0 +1,296 @@
+import json
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+import shared
+
+INDEX_PATH = "similarity_index.npz"
+
+# Vectors live beside the index as a plain .npy so they can be memory-mapped
+VECTORS_SUFFIX = ".vectors.npy"
+
+# Bump whenever encode() changes, so indexes saved by older code are rebuilt rather than loaded
+INDEX_VERSION = 2
+
+NUMERIC_COLUMNS = ["Str", "Dex", "Con", "Int", "Wis", "Cha", "HP", "AC", "level"]
+ONE_HOT_COLUMNS = ["justClass", "castingStat", "processedRace"]
+HASHED_COLUMNS = ["background", "subclass"]
+HASH_BUCKETS = 64
+FEATURE_COLUMNS = NUMERIC_COLUMNS + ONE_HOT_COLUMNS + HASHED_COLUMNS + ["processedSpells"]
+
+# Z-scores have unit variance per column, so this gives the numeric block about the same
+# weight as a unit-length one-hot block while keeping how far a build sits from the average
+NUMERIC_WEIGHT = 1 / np.sqrt(len(NUMERIC_COLUMNS))
+
+# Above this many rows the index clusters vectors and only scans the closest lists
+APPROXIMATE_MIN_ROWS = 200_000
+QUERY_BLOCK_ROWS = 65_536
+ENCODE_BLOCK_ROWS = 16_384
+
+
+def _split_values(series, strip_suffix=False):
+    # Multiclass fields look like "Sorcerer|Cleric"; spells like "Alarm*1|Aid*2"
+    values = shared.explode_list(series.fillna("").astype(str), strip_suffix=strip_suffix)
+    return values.index.to_numpy(), values.to_numpy(dtype=object)
+
+
+def _hash_bucket(values):
+    # crc32 is stable across processes, unlike hash()
+    unique, inverse = np.unique(values.astype(str), return_inverse=True)
+    buckets = np.array([zlib.crc32(value.encode()) % HASH_BUCKETS for value in unique], dtype=np.int64)
+    return buckets[inverse]
+
+
+def fit_encoder(df):
+    numeric = df[NUMERIC_COLUMNS].astype(float)
+    low, high = numeric.quantile(0.01), numeric.quantile(0.99)
+    clipped = numeric.clip(low, high, axis=1)
+
+    return {
+        "numeric_low": low.tolist(),
+        "numeric_high": high.tolist(),
+        "numeric_mean": clipped.mean().tolist(),
+        "numeric_std": clipped.std().replace(0, 1).tolist(),
+        "vocab": {
+            column: sorted(set(_split_values(df[column], strip_suffix=column == "processedSpells")[1]))
+            for column in ONE_HOT_COLUMNS + ["processedSpells"]
+        },
+    }
+
+
+def encoded_width(encoder):
+    vocab_width = sum(len(encoder["vocab"][column]) for column in ONE_HOT_COLUMNS + ["processedSpells"])
+    return len(NUMERIC_COLUMNS) + vocab_width + len(HASHED_COLUMNS) * HASH_BUCKETS
+
+
+def _normalize_rows(block):
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    np.divide(block, norms, out=block, where=norms > 0)
+
+
+def _encode_block(df, encoder):
+    vectors = np.zeros((len(df), encoded_width(encoder)), dtype=np.float32)
+
+    # Numerics: clip to the fitted 1st-99th percentile, then z-score
+    numeric = df[NUMERIC_COLUMNS].astype(float).fillna(pd.Series(encoder["numeric_mean"], index=NUMERIC_COLUMNS))
+    numeric = numeric.clip(encoder["numeric_low"], encoder["numeric_high"], axis=1)
+    numeric = (numeric - encoder["numeric_mean"]) / encoder["numeric_std"] * NUMERIC_WEIGHT
+    vectors[:, :len(NUMERIC_COLUMNS)] = numeric.to_numpy(np.float32)
+    col = len(NUMERIC_COLUMNS)
+
+    # Each block below is a view into vectors. Categorical blocks are scaled to unit length so
+    # each counts equally; the numeric block keeps its fixed weight.
+
+    # One-hot (multi-hot for multiclass) categoricals and the spell list
+    for column in ONE_HOT_COLUMNS + ["processedSpells"]:
+        vocab = pd.Index(encoder["vocab"][column])
+        rows, values = _split_values(df[column], strip_suffix=column == "processedSpells")
+        cols = vocab.get_indexer(values)
+        block = vectors[:, col:col + len(vocab)]
+        block[rows[cols >= 0], cols[cols >= 0]] = 1
+        _normalize_rows(block)
+        col += len(vocab)
+
+    # High-cardinality, free-text categoricals are hashed into a fixed number of buckets
+    for column in HASHED_COLUMNS:
+        rows, values = _split_values(df[column])
+        block = vectors[:, col:col + HASH_BUCKETS]
+        block[rows, _hash_bucket(values)] = 1
+        _normalize_rows(block)
+        col += HASH_BUCKETS
+
+    # Normalize whole rows so dot products are cosines
+    _normalize_rows(vectors)
+    return vectors
+
+
+def encode(df, encoder, out=None):
+    """Encode rows as unit-length float32 vectors, ENCODE_BLOCK_ROWS rows at a time.
+
+    ``out`` may be a preallocated array or memmap; only one block of dense rows is
+    held in memory at once.
+    """
+    df = df.reset_index(drop=True)
+    if out is None:
+        out = np.empty((len(df), encoded_width(encoder)), dtype=np.float32)
+    for start in range(0, len(df), ENCODE_BLOCK_ROWS):
+        block = df.iloc[start:start + ENCODE_BLOCK_ROWS].reset_index(drop=True)
+        out[start:start + len(block)] = _encode_block(block, encoder)
+    return out
+
+
+def _kmeans(vectors, n_lists, iterations=10, seed=0):
+    # Spherical k-means on a sample; centroids stay unit length
+    rng = np.random.default_rng(seed)
+    # Sorted row numbers read a memory-mapped matrix front to back
+    sample = vectors[np.sort(rng.choice(len(vectors), size=min(len(vectors), n_lists * 64), replace=False))]
+    centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        for i in range(n_lists):
+            members = sample[assignment == i]
+            if len(members):
+                centroids[i] = members.sum(axis=0)
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+    return centroids
+
+
+def _assign(vectors, centroids):
+    return np.concatenate([
+        np.argmax(vectors[start:start + QUERY_BLOCK_ROWS] @ centroids.T, axis=1)
+        for start in range(0, len(vectors), QUERY_BLOCK_ROWS)
+    ])
+
+
+def build_index(vectors, n_lists=None, out=None):
+    """Exact index over ``vectors``, or inverted lists copied into ``out`` (array or memmap) for large inputs."""
+    if n_lists is None:
+        n_lists = int(np.sqrt(len(vectors))) if len(vectors) >= APPROXIMATE_MIN_ROWS else 0
+    if not n_lists:
+        return {"vectors": vectors, "ids": np.arange(len(vectors)), "centroids": None, "offsets": None}
+
+    # Inverted lists: vectors are stored grouped by their nearest centroid, copied a block at a time
+    centroids = _kmeans(vectors, n_lists)
+    assignment = _assign(vectors, centroids)
+    order = np.argsort(assignment, kind="stable")
+    offsets = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+    if out is None:
+        out = np.empty(vectors.shape, dtype=vectors.dtype)
+    for start in range(0, len(order), QUERY_BLOCK_ROWS):
+        rows = order[start:start + QUERY_BLOCK_ROWS]
+        out[start:start + len(rows)] = vectors[rows]
+    return {"vectors": out, "ids": order, "centroids": centroids, "offsets": offsets}
+
+
+def _top_k(scores, k):
+    k = min(k, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def search(index, queries, k=10, n_probe=8):
+    """Return (row ids, cosine similarities) of the k nearest rows for each query vector.
+
+    Approximate searches pad rows with id -1 and similarity -inf when the probed lists run short.
+    """
+    queries = np.atleast_2d(queries).astype(np.float32)
+
+    if index["centroids"] is None:
+        # Exact: one matrix product per block of rows, merged into a running top k
+        best_ids = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(index["vectors"]), QUERY_BLOCK_ROWS):
+            scores = queries @ index["vectors"][start:start + QUERY_BLOCK_ROWS].T
+            ids = np.broadcast_to(np.arange(start, start + scores.shape[1]), scores.shape)
+            scores = np.hstack([best_scores, scores])
+            ids = np.hstack([best_ids, ids])
+            top = _top_k(scores, k)
+            best_scores = np.take_along_axis(scores, top, axis=1)
+            best_ids = np.take_along_axis(ids, top, axis=1)
+        return index["ids"][best_ids], best_scores
+
+    # Approximate: scan only the n_probe lists whose centroids are closest to each query.
+    # Probed lists can hold fewer than k rows; missing results are padded with id -1 and score -inf.
+    probes = _top_k(queries @ index["centroids"].T, n_probe)
+    offsets = index["offsets"]
+    all_ids = np.full((len(queries), k), -1, dtype=np.int64)
+    all_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    for row, (query, lists) in enumerate(zip(queries, probes)):
+        candidates = np.concatenate([np.arange(offsets[i], offsets[i + 1]) for i in lists])
+        if not len(candidates):
+            continue
+        scores = index["vectors"][candidates] @ query
+        top = _top_k(scores[None, :], k)[0]
+        all_ids[row, :len(top)] = index["ids"][candidates[top]]
+        all_scores[row, :len(top)] = scores[top]
+    return all_ids, all_scores
+
+
+def _layout():
+    # Everything apart from the data that decides what a stored vector means
+    return {
+        "version": INDEX_VERSION,
+        "numeric": NUMERIC_COLUMNS,
+        "one_hot": ONE_HOT_COLUMNS,
+        "hashed": HASHED_COLUMNS,
+        "hash_buckets": HASH_BUCKETS,
+    }
+
+
+def _vectors_path(path):
+    return os.path.splitext(path)[0] + VECTORS_SUFFIX
+
+
+def _build_on_disk(df, encoder, vectors_path):
+    # Vectors are encoded straight into memory-mapped files beside the index, so building
+    # holds at most one block of dense rows (plus the k-means sample) in memory
+    shape = (len(df), encoded_width(encoder))
+    unsorted_path = f"{vectors_path}.unsorted.tmp"
+    vectors = np.lib.format.open_memmap(unsorted_path, mode="w+", dtype=np.float32, shape=shape)
+    encode(df[FEATURE_COLUMNS], encoder, out=vectors)
+
+    if len(df) >= APPROXIMATE_MIN_ROWS:
+        built_path = f"{vectors_path}.tmp"
+        out = np.lib.format.open_memmap(built_path, mode="w+", dtype=np.float32, shape=shape)
+        index = build_index(vectors, out=out)
+        os.remove(unsorted_path)
+    else:
+        built_path = unsorted_path
+        index = build_index(vectors)
+
+    # Close the writable maps before swapping the finished file in and reopening it read-only
+    index["vectors"].flush()
+    index["vectors"] = vectors = None
+    os.replace(built_path, vectors_path)
+    index["vectors"] = np.load(vectors_path, mmap_mode="r")
+    return index
+
+
+def save_index(path, index, encoder, fingerprint):
+    """Write the index metadata; the vectors are already in the .npy file beside ``path``."""
+    arrays = {key: value for key, value in index.items() if value is not None and key != "vectors"}
+    meta = json.dumps({"encoder": encoder, "fingerprint": fingerprint, "layout": _layout()})
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, meta=np.array(meta), **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_index(path, fingerprint):
+    """Return (index, encoder) from disk, or None if missing, built from other data or by another encoding."""
+    vectors_path = _vectors_path(path)
+    if not (os.path.exists(path) and os.path.exists(vectors_path)):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data["meta"]))
+        if meta["fingerprint"] != fingerprint or meta.get("layout") != _layout():
+            return None
+        index = {key: data[key] if key in data else None for key in ["ids", "centroids", "offsets"]}
+
+    index["vectors"] = np.load(vectors_path, mmap_mode="r")
+    if index["vectors"].shape != (len(index["ids"]), encoded_width(meta["encoder"])):
+        return None
+    return index, meta["encoder"]
+
+
+def load_or_build(csv_path=shared.DATA_SMALL_CSV, path=INDEX_PATH):
+    """Return (characters, index, encoder), reusing the index on disk when the data is unchanged."""
+    df = pd.read_csv(csv_path)
+    fingerprint = shared.data_fingerprint(csv_path)
+
+    loaded = load_index(path, fingerprint)
+    if loaded is not None:
+        return df, *loaded
+
+    encoder = fit_encoder(df)
+    try:
+        index = _build_on_disk(df, encoder, _vectors_path(path))
+        save_index(path, index, encoder, fingerprint)
+    except OSError:
+        shared.logger.warning("could not persist similarity index to %s; keeping it in memory", path)
+        index = build_index(encode(df[FEATURE_COLUMNS], encoder))
+    return df, index, encoder
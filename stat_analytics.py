@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+import shared
+
+ABILITY_COLUMNS = ["Str", "Dex", "Con", "Int", "Wis", "Cha"]
+STAT_COLUMNS = ABILITY_COLUMNS + ["HP", "AC", "level"]
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+def _valid_rows(values):
+    # Drop hand-edited sheets with impossible scores (e.g. Str 103 or level 261)
+    abilities = values[:, : len(ABILITY_COLUMNS)]
+    hp, ac, level = values[:, -3], values[:, -2], values[:, -1]
+    return (
+        ((abilities >= 1) & (abilities <= 30)).all(axis=1)
+        & (hp > 0)
+        & (ac >= 1) & (ac <= 30)
+        & (level >= 1) & (level <= 20)
+    )
+
+
+def _empty_summary():
+    # Same shape as a real summary when no row of the selected classes survives filtering
+    return {
+        "counts": pd.Series(dtype="int64"),
+        "means": pd.DataFrame(columns=STAT_COLUMNS, dtype=float),
+        "quantiles": pd.DataFrame(
+            columns=STAT_COLUMNS,
+            index=pd.MultiIndex.from_arrays([[], []], names=["class", "quantile"]),
+            dtype=float,
+        ),
+        "correlations": {},
+        "casting_match": pd.Series(dtype=float),
+    }
+
+
+def class_stat_summary(df, classes=shared.SELECTED_CLASSES, class_column="justClass"):
+    """Per-class stat means, quantiles, correlations and casting-stat match rate.
+
+    Rows are sorted by class once so every class is a contiguous block; sums
+    come from a single ``np.add.reduceat`` over all stat columns, and the
+    quantiles and correlations run once per class rather than once per column.
+    """
+    codes = pd.Categorical(df[class_column], categories=classes).codes
+    values = df[STAT_COLUMNS].to_numpy(dtype=float)
+    keep = (codes >= 0) & _valid_rows(np.nan_to_num(values, nan=-1))
+
+    codes, values = codes[keep], values[keep]
+    casting = df["castingStat"].to_numpy(dtype=object)[keep]
+
+    order = np.argsort(codes, kind="stable")
+    codes, values, casting = codes[order], values[order], casting[order]
+
+    counts = np.bincount(codes, minlength=len(classes))
+    present = np.flatnonzero(counts)
+    if not len(present):
+        return _empty_summary()
+    starts = np.searchsorted(codes, present)
+    names = [classes[i] for i in present]
+
+    means = np.add.reduceat(values, starts, axis=0) / counts[present, None]
+
+    # Casting stat expected for each class, looked up per row by class code
+    primary = np.array([shared.CLASS_CASTING_STAT.get(cls) for cls in classes], dtype=object)
+    matches = np.bincount(codes, weights=casting == primary[codes], minlength=len(classes))
+
+    quantiles, correlations = {}, {}
+    for name, start, count in zip(names, starts, counts[present]):
+        block = values[start:start + count]
+        quantiles[name] = pd.DataFrame(np.quantile(block, QUANTILES, axis=0), index=QUANTILES, columns=STAT_COLUMNS)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            correlations[name] = pd.DataFrame(np.corrcoef(block, rowvar=False), index=STAT_COLUMNS, columns=STAT_COLUMNS)
+
+    return {
+        "counts": pd.Series(counts[present], index=names),
+        "means": pd.DataFrame(means, index=names, columns=STAT_COLUMNS),
+        "quantiles": pd.concat(quantiles, names=["class", "quantile"]),
+        "correlations": correlations,
+        "casting_match": pd.Series(matches[present] / counts[present], index=names),
+    }
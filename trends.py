@@ -0,0 +1,142 @@
+import json
+import os
+
+import pandas as pd
+
+import shared
+
+ROLLUP_DIR = os.path.join("rollups", "trends")
+MANIFEST = "manifest.json"
+ROLLUPS = ["class_week", "class_month", "race_month", "spell_month"]
+
+# Bump whenever compute_month or ROLLUPS change, so every stored month is rebuilt
+ROLLUP_VERSION = 2
+
+# Major 5e sourcebooks released while the dataset was being collected
+SOURCEBOOK_RELEASES = {
+    "Mordenkainen's Tome of Foes": "2018-05-29",
+    "Eberron: Rising from the Last War": "2019-11-19",
+    "Tasha's Cauldron of Everything": "2020-11-17",
+    "Fizban's Treasury of Dragons": "2021-10-26",
+    "Monsters of the Multiverse": "2022-05-17",
+}
+
+
+def _read_characters(csv_path):
+    df = pd.read_csv(csv_path, usecols=["hash", "date", "justClass", "processedRace", "processedSpells"])
+
+    # One vectorized parse; timezone dropped so periods line up with calendar months
+    df["date"] = pd.to_datetime(df["date"], utc=True, format="ISO8601", errors="coerce").dt.tz_localize(None)
+    df = df.dropna(subset=["date"])
+    df["month"] = df["date"].dt.to_period("M").dt.start_time
+    df["week"] = df["date"].dt.to_period("W-SUN").dt.start_time
+    return df
+
+
+def _month_fingerprints(df):
+    # Order-independent digest of each month's rows: the sum of their row hashes
+    row_hashes = pd.util.hash_pandas_object(df.drop(columns=["month", "week"]), index=False)
+    return row_hashes.groupby(df["month"]).sum().astype(str).to_dict()
+
+
+def _counts(df, period, key, rollup):
+    counts = df.groupby([period, key]).size().reset_index(name="count")
+    counts.columns = ["period", "key", "count"]
+    counts["rollup"] = rollup
+    return counts
+
+
+def compute_month(df):
+    """All rollups for the rows of a single month."""
+    spells = shared.explode_list(df["processedSpells"], strip_suffix=True)
+    spell_rows = pd.DataFrame({"month": df.loc[spells.index, "month"], "spell": spells})
+
+    return pd.concat([
+        _counts(df, "week", "justClass", "class_week"),
+        _counts(df, "month", "justClass", "class_month"),
+        _counts(df, "month", "processedRace", "race_month"),
+        _counts(spell_rows, "month", "spell", "spell_month"),
+    ], ignore_index=True)
+
+
+def _replace(path, write):
+    # Write to a temp file beside the target and rename, so readers never see a partial file
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write_json(data, path):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+
+
+def update_rollups(csv_path=shared.DATA_SMALL_CSV, rollup_dir=ROLLUP_DIR):
+    """Recompute only the months whose rows changed; return the month keys that were rebuilt.
+
+    If the source file is unchanged since the last update, nothing is read or written.
+    Otherwise the whole CSV is parsed and hashed, and only changed months are recomputed.
+    """
+    manifest_path = os.path.join(rollup_dir, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    source = shared.data_fingerprint(csv_path)
+    current = manifest.get("version") == ROLLUP_VERSION
+    if current and manifest.get("source") == source:
+        return []
+
+    df = _read_characters(csv_path)
+    fingerprints = {month.strftime("%Y-%m"): value for month, value in _month_fingerprints(df).items()}
+
+    # Months stored by an older version of the rollups are all rebuilt
+    stored = manifest.get("months", {}) if current else {}
+    rebuilt = [month for month, value in fingerprints.items() if stored.get(month) != value]
+
+    os.makedirs(rollup_dir, exist_ok=True)
+    if rebuilt:
+        month_keys = df["month"].dt.strftime("%Y-%m")
+        for month in rebuilt:
+            rollup = compute_month(df[month_keys == month])
+            _replace(os.path.join(rollup_dir, f"{month}.parquet"), lambda path: rollup.to_parquet(path, index=False))
+
+    # Manifest last, so it never lists a partition that isn't on disk yet
+    _replace(manifest_path, lambda path: _write_json({"version": ROLLUP_VERSION, "source": source, "months": fingerprints}, path))
+
+    # Months that disappeared from the source are dropped as well
+    for name in os.listdir(rollup_dir):
+        if name.endswith(".parquet") and name[: -len(".parquet")] not in fingerprints:
+            os.remove(os.path.join(rollup_dir, name))
+    return rebuilt
+
+
+def load_rollups(rollup_dir=ROLLUP_DIR):
+    """Concatenate the stored monthly partitions into one rollup table per rollup kind."""
+    with open(os.path.join(rollup_dir, MANIFEST)) as f:
+        months = sorted(json.load(f)["months"])
+    table = pd.concat(
+        [pd.read_parquet(os.path.join(rollup_dir, f"{month}.parquet")) for month in months],
+        ignore_index=True,
+    )
+
+    # Weeks that straddle a month boundary are split across partitions, so sum them back together
+    table = table.groupby(["rollup", "period", "key"], as_index=False)["count"].sum()
+    return {rollup: table[table["rollup"] == rollup].drop(columns="rollup") for rollup in ROLLUPS}
+
+
+def share_over_time(rollup, start, end, keys=None):
+    """Per-period share (%) of each key, filtered to [start, end] on the rollup alone."""
+    window = rollup[(rollup["period"] >= start) & (rollup["period"] <= end)]
+    totals = window.groupby("period")["count"].transform("sum")
+    window = window.assign(share=window["count"] / totals.to_numpy() * 100)
+    if keys is not None:
+        window = window[window["key"].isin(keys)]
+    return window
+
+
+def top_keys(rollup, start, end, n):
+    window = rollup[(rollup["period"] >= start) & (rollup["period"] <= end)]
+    totals = window.groupby("key")["count"].sum()
+    return totals.nlargest(n).index.tolist() if len(totals) else []